@@ -1,10 +1,15 @@
 import uuid
+from logging import getLogger
+from typing import Optional
+
 import httpx
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
 from fastapi.responses import PlainTextResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from blaxel.telemetry.span import SpanManager
 
+logger = getLogger(__name__)
+
 router = APIRouter()
 
 # Hardcoded API key - update this with your API key from https://eval.rippletide.com
@@ -14,42 +19,143 @@ RIPPLETIDE_AGENT_ID = "your-agent-id-here"
 # Base URL for Rippletide API
 RIPPLETIDE_BASE_URL = "https://agent.rippletide.com/api/sdk"
 
+# Shared connection pool for upstream calls, reused across HTTP and WebSocket turns
+_client: Optional[httpx.AsyncClient] = None
+
 class RequestInput(BaseModel):
     inputs: str
 
-@router.post("/")
-async def handle_request(request: Request):
-    if RIPPLETIDE_API_KEY == "your-api-key-here":
-        raise HTTPException(status_code=500, detail="RIPPLETIDE_API_KEY is not configured. Please update it in agent.py")
-    if RIPPLETIDE_AGENT_ID == "your-agent-id-here":
-        raise HTTPException(status_code=500, detail="RIPPLETIDE_AGENT_ID is not configured. Please update it in agent.py")
+def get_client() -> httpx.AsyncClient:
+    """Return the shared upstream client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=360.0)
+    return _client
 
-    body = RequestInput(**await request.json())
+async def close_client() -> None:
+    """Close the shared upstream client, if any."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-    # Get or generate conversation UUID
-    conversation_uuid = request.headers.get("X-Conversation-UUID")
-    if not conversation_uuid:
-        conversation_uuid = str(uuid.uuid4())
+def check_configuration() -> Optional[str]:
+    """Return an error message if the agent is not configured, None otherwise."""
+    if RIPPLETIDE_API_KEY == "your-api-key-here":
+        return "RIPPLETIDE_API_KEY is not configured. Please update it in agent.py"
+    if RIPPLETIDE_AGENT_ID == "your-agent-id-here":
+        return "RIPPLETIDE_AGENT_ID is not configured. Please update it in agent.py"
+    return None
 
+async def ask_agent(user_message: str, conversation_uuid: str) -> str:
+    """Send one conversation turn to the Rippletide agent and return its answer."""
     with SpanManager("blaxel-rippletide-customer-support").create_active_span("agent-request", {}):
         url = f"{RIPPLETIDE_BASE_URL}/chat/{RIPPLETIDE_AGENT_ID}"
-        
+
         headers = {
             "x-api-key": RIPPLETIDE_API_KEY,
             "Content-Type": "application/json",
             "x-rippletide-agent-id": str(RIPPLETIDE_AGENT_ID),
             "x-rippletide-conversation-id": conversation_uuid,
         }
-        
+
         payload = {
-            "user_message": body.inputs,
+            "user_message": user_message,
             "conversation_uuid": conversation_uuid
         }
-        
-        async with httpx.AsyncClient(timeout=360.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
-        
-        answer_text = response_data.get("answer", "No answer provided")
-        return PlainTextResponse(content=answer_text)
\ No newline at end of file
+
+        response = await get_client().post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        response_data = response.json()
+        if not isinstance(response_data, dict):
+            raise ValueError(f"Unexpected response from Rippletide: {response_data!r}")
+
+        return response_data.get("answer", "No answer provided")
+
+@router.post("/")
+async def handle_request(request: Request):
+    error = check_configuration()
+    if error:
+        raise HTTPException(status_code=500, detail=error)
+
+    body = RequestInput(**await request.json())
+
+    # Get or generate conversation UUID
+    conversation_uuid = request.headers.get("X-Conversation-UUID")
+    if not conversation_uuid:
+        conversation_uuid = str(uuid.uuid4())
+
+    answer_text = await ask_agent(body.inputs, conversation_uuid)
+    return PlainTextResponse(content=answer_text)
+
+@router.websocket("/ws")
+async def handle_websocket(websocket: WebSocket):
+    """
+    Persistent conversation bound to a single conversation UUID.
+
+    The UUID is taken from the X-Conversation-UUID header or the
+    conversation_uuid query parameter (browsers cannot set WebSocket headers),
+    and generated otherwise; a value that is not a UUID closes the connection
+    with code 1008. Each client message is a JSON object with the same
+    shape as the POST body ({"inputs": "..."}) and is answered with
+    {"answer": "..."}; a failed turn, including a non-text frame, is answered
+    with {"error": "..."} and the connection stays open for the next one.
+    """
+    requested_uuid = (
+        websocket.headers.get("X-Conversation-UUID")
+        or websocket.query_params.get("conversation_uuid")
+    )
+    try:
+        # Normalized, as the value is echoed back in a handshake header
+        conversation_uuid = str(uuid.UUID(requested_uuid)) if requested_uuid else str(uuid.uuid4())
+    except ValueError:
+        conversation_uuid = None
+
+    # Closing before accept() is turned into an HTTP 403, so report errors on the open socket
+    if conversation_uuid is None:
+        await websocket.accept()
+        error = "conversation_uuid must be a UUID"
+        await websocket.send_json({"error": error})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=error)
+        return
+
+    await websocket.accept(headers=[(b"x-conversation-uuid", conversation_uuid.encode("latin-1"))])
+
+    error = check_configuration()
+    if error:
+        await websocket.send_json({"error": error})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason=error)
+        return
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("text") is None:
+                await websocket.send_json({"error": "Only text frames are supported"})
+                continue
+            try:
+                body = RequestInput.model_validate_json(message["text"])
+            except ValidationError as e:
+                await websocket.send_json({"error": str(e)})
+                continue
+            try:
+                answer_text = await ask_agent(body.inputs, conversation_uuid)
+            except httpx.HTTPStatusError as e:
+                # The exception text includes the upstream URL and agent ID, keep it server-side
+                logger.error(f"Error during websocket turn: {e}", exc_info=e)
+                await websocket.send_json({"error": f"Upstream request failed (status {e.response.status_code})"})
+                continue
+            except httpx.HTTPError as e:
+                logger.error(f"Error during websocket turn: {e}", exc_info=e)
+                await websocket.send_json({"error": "Upstream request failed"})
+                continue
+            except ValueError as e:
+                # Malformed upstream body, which may echo upstream data, keep it server-side
+                logger.error(f"Error during websocket turn: {e}", exc_info=e)
+                await websocket.send_json({"error": "Upstream request failed"})
+                continue
+            await websocket.send_json({"answer": answer_text})
+    except WebSocketDisconnect:
+        pass
@@ -6,7 +6,7 @@ from fastapi import FastAPI
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from .middleware import init_middleware, init_error_handlers
-from .agent import router
+from .agent import close_client, router
 
 
 logger = getLogger(__name__)
@@ -16,6 +16,7 @@ logger = getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info(f"Server running on port {os.getenv('PORT', 80)}")
     yield
+    await close_client()
     logger.info("Server shutting down")
 
 
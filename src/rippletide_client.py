@@ -6,12 +6,20 @@ This module provides two client classes:
 2. RippletideEvalClient - For creating evaluation agents (like starter pattern)
 """
 import uuid
+import time
+import logging
 import random
+import threading
 import requests
 import httpx
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional, Dict, Any, List, BinaryIO, Union
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class RippletideAgent:
     """
@@ -175,6 +183,155 @@ class RippletideAgent:
         return response.json()
 
 
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every request of one or more clients.
+    
+    Args:
+        requests_per_second: Sustained request rate (None for no rate limit)
+        burst: Maximum number of requests that can be sent back to back (defaults to one second of traffic)
+        max_concurrency: Maximum number of requests in flight at once (None for no limit)
+    """
+    
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        if requests_per_second is not None and requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be at least 1")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        self.rate = requests_per_second
+        self.capacity = float(burst if burst is not None else max(1, int(requests_per_second or 1)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+    
+    def acquire(self) -> None:
+        """Take a concurrency slot, then block until a request may be sent."""
+        # Slot first: a token taken while waiting for a slot would be spent late and break the rate
+        if self._slots:
+            self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    wait = self.paused_until - now
+                    if wait <= 0 and self.rate is None:
+                        break
+                    if wait <= 0:
+                        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                        self.updated_at = now
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            break
+                        wait = (1 - self.tokens) / self.rate
+                time.sleep(wait)
+        except BaseException:
+            self.release()
+            raise
+    
+    def release(self) -> None:
+        """Give back the concurrency slot taken by acquire()."""
+        if self._slots:
+            self._slots.release()
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for the given delay, e.g. after a Retry-After response."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class MultipartFileBody:
+    """
+    Streamed multipart/form-data body holding a single file field.
+    
+    The file is read in chunks while the request is sent instead of being
+    buffered in memory, and the body length is known up front so the request
+    still carries a Content-Length header.
+    
+    Args:
+        field_name: Name of the form field
+        filename: File name sent to the server
+        fileobj: Seekable binary file-like object positioned at the start of the content
+        content_type: Content type of the file part
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, field_name: str, filename: str, fileobj: BinaryIO, content_type: str):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{self._quote(field_name)}"; '
+            f'filename="{self._quote(filename)}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode()
+        tail = f'\r\n--{boundary}--\r\n'.encode()
+        
+        start = fileobj.tell()
+        file_size = fileobj.seek(0, 2) - start
+        fileobj.seek(start)
+        
+        self._parts = [head, fileobj, tail]
+        self._file_start = start
+        self._length = len(head) + file_size + len(tail)
+        self.seek(0)
+    
+    @staticmethod
+    def _quote(value: str) -> str:
+        """Escape a header parameter value the way urllib3's multipart encoder does."""
+        return value.translate({10: "%0A", 13: "%0D", 34: "%22"})
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Rewind to the start of the body (only seeking to 0 is supported)."""
+        if offset != 0 or whence != 0:
+            raise ValueError("MultipartFileBody can only be rewound to the start")
+        self._index = 0
+        self._offset = 0
+        self._parts[1].seek(self._file_start)
+        return 0
+    
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._index < len(self._parts) and size != 0:
+            part = self._parts[self._index]
+            if isinstance(part, bytes):
+                end = len(part) if size < 0 else min(len(part), self._offset + size)
+                chunk = part[self._offset:end]
+                self._offset = end
+                if self._offset >= len(part):
+                    self._index += 1
+                    self._offset = 0
+            else:
+                chunk = part.read(size if size > 0 else self.CHUNK_SIZE)
+                if not chunk:
+                    self._index += 1
+                    continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b''.join(chunks)
+
+
 class RippletideEvalClient:
     """
     Client for creating evaluation agents and evaluating responses.
@@ -184,18 +341,47 @@ class RippletideEvalClient:
         session_id: Optional session ID for anonymous requests (will be auto-generated if not provided and no api_key)
         api_key: Optional API key for authenticated requests
         base_url: Base URL for the evaluation API (defaults to localhost:3001)
+        requests_per_second: Optional client-side request rate budget
+        max_concurrency: Optional limit on requests in flight across threads
+        max_retries: Number of retries on overload responses (default: 8); non-idempotent
+            methods are only retried on 429 and 503, which mean the request was not processed
+        backoff_factor: Base delay in seconds for exponential backoff (default: 1.0)
+        max_retry_after: Longest Retry-After in seconds the client will wait for; a longer one
+            fails the request instead of stalling every thread (default: 600)
+        rate_limiter: Optional RateLimiter to share one budget between clients
+            (overrides requests_per_second and max_concurrency)
+        pool_size: Optional number of pooled connections per host; set it to at least the
+            number of threads sharing the client (requests keeps 10 by default)
     """
     
     BASE_URL = "http://localhost:3001"
+    # 429/503 mean the request was not processed, so any method can be retried.
+    # A gateway 502/504 may hide a request that went through, so only idempotent
+    # methods are retried on those.
+    RETRY_STATUS_CODES = (429, 503)
+    IDEMPOTENT_RETRY_STATUS_CODES = (429, 502, 503, 504)
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+    MAX_BACKOFF = 60.0
 
     def __init__(
         self,
         session_id: Optional[str] = None,
         api_key: Optional[str] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        requests_per_second: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: int = 8,
+        backoff_factor: float = 1.0,
+        max_retry_after: float = 600.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        pool_size: Optional[int] = None
     ):
         self.base_url = (base_url or self.BASE_URL).rstrip('/')
         self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_retry_after = max_retry_after
+        self.rate_limiter = rate_limiter or RateLimiter(requests_per_second, max_concurrency=max_concurrency)
         
         # Generate session_id if not provided and no api_key
         if not api_key and not session_id:
@@ -204,6 +390,10 @@ class RippletideEvalClient:
             self.session_id = session_id
         
         self.session = requests.Session()
+        if pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
         
         # Set up headers
         if self.api_key:
@@ -221,12 +411,82 @@ class RippletideEvalClient:
         endpoint: str,
         **kwargs
     ) -> requests.Response:
-        """Make an HTTP request to the API."""
+        """
+        Make an HTTP request to the API.
+        
+        Requests go through the shared rate limiter. Overload responses are retried
+        up to max_retries times (see RETRY_STATUS_CODES). A Retry-After sent by the
+        server is honored as given, up to max_retry_after; otherwise the client uses
+        jittered exponential backoff capped at MAX_BACKOFF.
+        """
         url = f"{self.base_url}{endpoint}"
-        response = self.session.request(method, url, **kwargs)
+        if method.upper() in self.IDEMPOTENT_METHODS:
+            retry_status_codes = self.IDEMPOTENT_RETRY_STATUS_CODES
+        else:
+            retry_status_codes = self.RETRY_STATUS_CODES
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._rewind_body(kwargs)
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            finally:
+                self.rate_limiter.release()
+            
+            if response.status_code not in retry_status_codes or attempt == self.max_retries:
+                break
+            
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = min(self.MAX_BACKOFF, self.backoff_factor * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+            elif delay > self.max_retry_after:
+                raise requests.HTTPError(
+                    f"{response.status_code} for {method} {endpoint}: server asked to retry after "
+                    f"{delay:.0f}s, more than max_retry_after ({self.max_retry_after:.0f}s)",
+                    response=response
+                )
+            else:
+                # The server asked everyone to back off, not just this thread
+                self.rate_limiter.pause(delay)
+            logger.warning(
+                "%s %s returned %s, retrying in %.1fs (attempt %d/%d)",
+                method, endpoint, response.status_code, delay, attempt + 1, self.max_retries
+            )
+            time.sleep(delay)
+        
         response.raise_for_status()
         return response
     
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Parse the Retry-After header (delay in seconds or HTTP date), if any."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    @staticmethod
+    def _rewind_body(kwargs: Dict[str, Any]) -> None:
+        """Seek file-like request bodies back to the start before a retry."""
+        bodies = [kwargs.get('data')]
+        files = kwargs.get('files') or {}
+        for value in (files.values() if isinstance(files, dict) else (v for _, v in files)):
+            bodies.append(value[1] if isinstance(value, tuple) else value)
+        for body in bodies:
+            if hasattr(body, 'seek'):
+                body.seek(0)
+    
     def create_agent(
         self,
         name: str,
@@ -280,9 +540,11 @@ class RippletideEvalClient:
         """
         Extract questions and expected answers from a PDF file.
         
+        The file is streamed to the server rather than loaded in memory.
+        
         Args:
             agent_id: ID of the agent
-            pdf_path: Path to the PDF file or file-like object
+            pdf_path: Path to the PDF file or seekable file-like object
             
         Returns:
             Dictionary containing extraction results and Q&A pairs
@@ -292,15 +554,18 @@ class RippletideEvalClient:
         # Handle both file path and file-like object
         if isinstance(pdf_path, (str, Path)):
             with open(pdf_path, 'rb') as f:
-                files = {'file': (Path(pdf_path).name, f, 'application/pdf')}
-                response = self._make_request('POST', endpoint, files=files)
+                response = self._upload_file(endpoint, Path(pdf_path).name, f)
         else:
             # Assume it's a file-like object
-            files = {'file': ('document.pdf', pdf_path, 'application/pdf')}
-            response = self._make_request('POST', endpoint, files=files)
+            response = self._upload_file(endpoint, 'document.pdf', pdf_path)
         
         return response.json()
     
+    def _upload_file(self, endpoint: str, filename: str, fileobj: BinaryIO) -> requests.Response:
+        """POST a PDF as a streamed multipart upload."""
+        body = MultipartFileBody('file', filename, fileobj, 'application/pdf')
+        return self._make_request('POST', endpoint, data=body, headers={'Content-Type': body.content_type})
+    
     def get_test_prompts(self, agent_id: str) -> List[Dict[str, Any]]:
         """
         Get all test prompts (questions and expected answers) for an agent.
@@ -2,18 +2,22 @@
 """
 Rippletide Agent Setup Script
 
-Creates an SDK agent, extracts questions from a PDF, asks the agent each question,
-and evaluates the answers using the eval client.
+Creates an SDK agent, extracts questions from one or more PDFs, asks the agent
+each question, and evaluates the answers using the eval client.
 
 Usage:
     uv run src/setup_agent.py agent_config.json --pdf knowledge.pdf
+    uv run src/setup_agent.py agent_config.json --pdf docs/ "more/**/*.pdf" --workers 8
 """
 
 import sys
+import glob
 import json
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, List
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -30,6 +34,191 @@ def load_config_file(file_path: Path) -> Any:
     with open(file_path, 'r') as f:
         return json.load(f)
 
+def positive_int(value: str) -> int:
+    """Argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def non_negative_int(value: str) -> int:
+    """Argparse type for options that must be at least 0"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {value}")
+    return number
+
+def positive_float(value: str) -> float:
+    """Argparse type for options that must be greater than 0"""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def resolve_documents(sources: List[str]) -> List[Path]:
+    """Expand files, directories (searched recursively for PDFs) and glob patterns into a list of PDFs"""
+    documents = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            matches = sorted(p for p in path.rglob('*') if p.is_file() and p.suffix.lower() == '.pdf')
+        elif glob.has_magic(source):
+            matches = sorted(
+                Path(p) for p in glob.glob(source, recursive=True)
+                if Path(p).is_file() and Path(p).suffix.lower() == '.pdf'
+            )
+        elif path.is_file():
+            matches = [path]
+        else:
+            print(f"Warning: No document found at {source}", file=sys.stderr)
+            matches = []
+        for match in matches:
+            if match not in documents:
+                documents.append(match)
+    return documents
+
+def get_question(qa_pair: Dict[str, Any]) -> str:
+    """Return the question of a Q&A pair, whatever key the backend used"""
+    return qa_pair.get('question', qa_pair.get('prompt', ''))
+
+def extract_document(eval_client: RippletideEvalClient, agent_id: str, pdf_path: Path) -> Dict[str, Any]:
+    """Extract Q&A pairs from one PDF, recording timing and failure instead of raising"""
+    start = time.monotonic()
+    try:
+        result = eval_client.extract_questions_from_pdf(agent_id=agent_id, pdf_path=str(pdf_path))
+        # Try different possible keys for Q&A pairs
+        qa_pairs = result.get('qaPairs', result.get('qa_pairs', result.get('questions', [])))
+        if not isinstance(qa_pairs, list) or not all(isinstance(qa_pair, dict) for qa_pair in qa_pairs):
+            raise ValueError(f"Unexpected Q&A pairs in extraction result: {qa_pairs!r}")
+        error = None
+    except Exception as e:
+        result, qa_pairs, error = None, [], str(e)
+    return {
+        'path': str(pdf_path),
+        'result': result,
+        'qa_pairs': qa_pairs,
+        'error': error,
+        'seconds': time.monotonic() - start,
+    }
+
+def extract_documents(
+    eval_client: RippletideEvalClient,
+    agent_id: str,
+    documents: List[Path],
+    workers: int
+) -> List[Dict[str, Any]]:
+    """Upload documents concurrently and report each one as it finishes, returned in input order"""
+    reports = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(extract_document, eval_client, agent_id, doc): doc for doc in documents}
+        for done, future in enumerate(as_completed(futures), 1):
+            report = future.result()
+            reports[futures[future]] = report
+            if report['error']:
+                print(f"  [{done}/{len(documents)}] [FAILED] {report['path']} after {report['seconds']:.2f}s: {report['error']}")
+            else:
+                print(f"  [{done}/{len(documents)}] [SUCCESS] {report['path']}: {len(report['qa_pairs'])} Q&A pairs in {report['seconds']:.2f}s")
+    return [reports[doc] for doc in documents]
+
+def evaluate_answer(
+    eval_client: RippletideEvalClient,
+    eval_agent_id: str,
+    result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Evaluate the agent's answer to one question, recording failure instead of raising"""
+    start = time.monotonic()
+    try:
+        result['report'] = eval_client.evaluate(
+            agent_id=eval_agent_id,
+            question=result['question'],
+            expected_answer=result['expected_answer'] if result['expected_answer'] else None,
+            answer=result['agent_answer']
+        )
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.monotonic() - start
+    return result
+
+def evaluate_questions(
+    agent: RippletideAgent,
+    eval_client: RippletideEvalClient,
+    eval_agent_id: str,
+    qa_pairs: List[Dict[str, Any]],
+    workers: int
+) -> List[Dict[str, Any]]:
+    """
+    Ask the SDK agent each question in turn and evaluate the answers concurrently.
+    
+    The SDK agent is not rate-limited nor retried, so it is asked one question at a
+    time; evaluations go through the eval client's rate limiter on a thread pool.
+    Failures are recorded per question and results are returned in input order.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for i, qa_pair in enumerate(qa_pairs, 1):
+            # Try different possible keys for question and answer
+            question = get_question(qa_pair)
+            expected_answer = qa_pair.get('answer', qa_pair.get('expectedAnswer', qa_pair.get('expected_answer', '')))
+            
+            if not question:
+                print(f"\nSkipping Q&A pair {i}: No question found")
+                print(f"  Available keys: {list(qa_pair.keys())}")
+                continue
+            
+            print(f"\n--- Question {i}/{len(qa_pairs)} ---")
+            print(f"Question: {question}")
+            if expected_answer:
+                print(f"Expected Answer: {expected_answer}")
+            
+            result = {
+                'question': question,
+                'expected_answer': expected_answer,
+                'agent_answer': None,
+                'report': None,
+                'error': None,
+            }
+            results[i] = result
+            
+            # Ask the SDK agent
+            try:
+                response = agent.chat(question)
+                if response is None:
+                    raise ValueError("No response from agent")
+            except Exception as e:
+                result['error'] = str(e)
+                print(f"[FAILED] {result['error']}")
+                continue
+            result['agent_answer'] = response.get("answer", "No answer provided")
+            print(f"Agent Answer: {result['agent_answer']}")
+            
+            futures[executor.submit(evaluate_answer, eval_client, eval_agent_id, result)] = i
+        
+        print(f"\nWaiting for {len(futures)} evaluation(s) with {workers} workers")
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            print(f"\n--- Evaluation {futures[future]}/{len(qa_pairs)} ({done}/{len(futures)} done, {result['seconds']:.2f}s) ---")
+            print(f"Question: {result['question']}")
+            if result['error']:
+                print(f"[FAILED] {result['error']}")
+            else:
+                print(f"Evaluation Label: {result['report'].get('label', 'N/A')}")
+                print(f"Evaluation Justification: {result['report'].get('justification', 'N/A')}")
+    return [results[i] for i in sorted(results)]
+
+def merge_qa_pairs(reports: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge Q&A pairs from all documents, keeping the first pair for each distinct question"""
+    merged = []
+    seen = set()
+    for report in reports:
+        for qa_pair in report['qa_pairs']:
+            key = " ".join((get_question(qa_pair) or '').split()).casefold()
+            if key and key in seen:
+                continue
+            seen.add(key)
+            merged.append(qa_pair)
+    return merged
+
 def main():
     """Main setup function"""
     parser = argparse.ArgumentParser(description="Setup Rippletide Agent and Evaluate")
@@ -41,8 +230,39 @@ def main():
     parser.add_argument(
         "--pdf",
         type=str,
+        nargs="+",
         required=True,
-        help="Path to PDF file for extracting questions and adding to eval agent knowledge base"
+        help="PDF files, directories or glob patterns for extracting questions and adding to eval agent knowledge base"
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=4,
+        help="Number of documents uploaded and answers evaluated concurrently (default: 4)"
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=positive_float,
+        default=None,
+        help="Maximum request rate against the evaluation API (default: no limit)"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=positive_int,
+        default=None,
+        help="Maximum number of evaluation API requests in flight at once (default: no limit)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=non_negative_int,
+        default=8,
+        help="Number of retries when the evaluation API is overloaded (default: 8)"
+    )
+    parser.add_argument(
+        "--max-retry-after",
+        type=positive_float,
+        default=600.0,
+        help="Longest Retry-After in seconds to wait for before failing a request (default: 600)"
     )
     
     args = parser.parse_args()
@@ -58,6 +278,11 @@ def main():
     
     config = load_config_file(config_path)
     
+    documents = resolve_documents(args.pdf)
+    if not documents:
+        print(f"Error: No PDF files found in: {', '.join(args.pdf)}", file=sys.stderr)
+        sys.exit(1)
+    
     # Step 1: Create SDK agent using RippletideAgent
     print("=" * 60)
     print("Step 1: Creating SDK Agent")
@@ -77,32 +302,37 @@ def main():
     
     # Step 2: Create eval agent and extract questions from PDF
     print("\n" + "=" * 60)
-    print("Step 2: Creating Evaluation Agent and Extracting Questions from PDF")
+    print("Step 2: Creating Evaluation Agent and Extracting Questions from PDFs")
     print("=" * 60)
     
-    eval_client = RippletideEvalClient(api_key=RIPPLETIDE_API_KEY, base_url=RIPPLETIDE_EVAL_BASE_URL)
+    eval_client = RippletideEvalClient(
+        api_key=RIPPLETIDE_API_KEY,
+        base_url=RIPPLETIDE_EVAL_BASE_URL,
+        requests_per_second=args.requests_per_second,
+        max_concurrency=args.max_concurrency,
+        max_retries=args.max_retries,
+        max_retry_after=args.max_retry_after,
+        pool_size=args.workers
+    )
     
     # Create an eval agent for evaluation
     eval_agent = eval_client.create_agent(name="Evaluation Agent")
     eval_agent_id = eval_agent['id']
     print(f"Created evaluation agent with ID: {eval_agent_id}")
     
-    # Extract questions from PDF
-    pdf_path = Path(args.pdf)
-    if not pdf_path.exists():
-        print(f"Error: PDF file not found: {pdf_path}", file=sys.stderr)
-        sys.exit(1)
-    print(f"\nExtracting questions from PDF: {pdf_path}")
-    result = eval_client.extract_questions_from_pdf(
-        agent_id=eval_agent_id,
-        pdf_path=str(pdf_path)
+    # Extract questions from PDFs
+    print(f"\nExtracting questions from {len(documents)} PDF(s) with {args.workers} workers")
+    start = time.monotonic()
+    extraction_reports = extract_documents(eval_client, eval_agent_id, documents, args.workers)
+    failed = [report for report in extraction_reports if report['error']]
+    extracted = sum(len(report['qa_pairs']) for report in extraction_reports)
+    qa_pairs = merge_qa_pairs(extraction_reports)
+    print(
+        f"Processed {len(documents) - len(failed)}/{len(documents)} PDF(s) in {time.monotonic() - start:.2f}s: "
+        f"{extracted} Q&A pairs extracted, {len(qa_pairs)} after deduplication"
     )
-    
-    # Debug: print the result structure
-    print(f"PDF extraction result keys: {list(result.keys()) if isinstance(result, dict) else 'Not a dict'}")
-    
-    # Try different possible keys for Q&A pairs
-    qa_pairs = result.get('qaPairs', result.get('qa_pairs', result.get('questions', [])))
+    for report in failed:
+        print(f"  Failed: {report['path']}: {report['error']}", file=sys.stderr)
     
     # If still empty, try to get test prompts from the agent
     if not qa_pairs:
@@ -115,11 +345,12 @@ def main():
         except Exception as e:
             print(f"Could not get test prompts: {e}")
     
-    print(f"Extracted {len(qa_pairs)} Q&A pairs from PDF")
+    print(f"Extracted {len(qa_pairs)} Q&A pairs from PDFs")
     
     if not qa_pairs:
-        print("Error: No Q&A pairs extracted from PDF", file=sys.stderr)
-        print(f"Full extraction result: {json.dumps(result, indent=2)}", file=sys.stderr)
+        print("Error: No Q&A pairs extracted from PDFs", file=sys.stderr)
+        for report in extraction_reports:
+            print(f"Extraction result for {report['path']}: {json.dumps(report['result'] or report['error'], indent=2)}", file=sys.stderr)
         sys.exit(1)
     
     # Step 3: Ask SDK agent each question and evaluate
@@ -127,53 +358,12 @@ def main():
     print("Step 3: Asking SDK Agent Questions and Evaluating Answers")
     print("=" * 60)
     
-    all_reports = []
-    
-    for i, qa_pair in enumerate(qa_pairs, 1):
-        # Try different possible keys for question and answer
-        question = qa_pair.get('question', qa_pair.get('prompt', ''))
-        expected_answer = qa_pair.get('answer', qa_pair.get('expectedAnswer', qa_pair.get('expected_answer', '')))
-        
-        if not question:
-            print(f"\nSkipping Q&A pair {i}: No question found")
-            print(f"  Available keys: {list(qa_pair.keys())}")
-            continue
-        
-        print(f"\n--- Question {i}/{len(qa_pairs)} ---")
-        print(f"Question: {question}")
-        if expected_answer:
-            print(f"Expected Answer: {expected_answer}")
-        
-        # Ask the SDK agent
-        response = agent.chat(question)
-        if response is None:
-            print("Error: No response from agent", file=sys.stderr)
-            continue
-        agent_answer = response.get("answer", "No answer provided")
-        print(f"Agent Answer: {agent_answer}")
-        
-        # Evaluate the answer
-        try:
-            report = eval_client.evaluate(
-                agent_id=eval_agent_id,
-                question=question,
-                expected_answer=expected_answer if expected_answer else None,
-                answer=agent_answer
-            )
-        except Exception as e:
-            print(f"Error evaluating answer: {e}")
-            # Continue with next question instead of failing completely
-            continue
-        
-        all_reports.append({
-            'question': question,
-            'expected_answer': expected_answer,
-            'agent_answer': agent_answer,
-            'report': report
-        })
-        
-        print(f"Evaluation Label: {report.get('label', 'N/A')}")
-        print(f"Evaluation Justification: {report.get('justification', 'N/A')}")
+    results = evaluate_questions(agent, eval_client, eval_agent_id, qa_pairs, args.workers)
+    all_reports = [
+        {key: result[key] for key in ('question', 'expected_answer', 'agent_answer', 'report')}
+        for result in results if not result['error']
+    ]
+    failed_evaluations = [result for result in results if result['error']]
     
     # Step 4: Print summary of all evaluation reports
     print("\n" + "=" * 60)
@@ -182,6 +372,11 @@ def main():
     print(f"SDK Agent ID: {agent_id}")
     print(f"Evaluation Agent ID: {eval_agent_id}")
     print(f"Total Questions Evaluated: {len(all_reports)}")
+    print(f"Failed Evaluations: {len(failed_evaluations)}")
+    if failed_evaluations:
+        print(f"{len(failed_evaluations)} question(s) could not be evaluated:", file=sys.stderr)
+        for result in failed_evaluations:
+            print(f"  Failed: {result['question']}: {result['error']}", file=sys.stderr)
     print(f"\nDetailed Reports:")
     print(json.dumps(all_reports, indent=2))
     